@@ -18,6 +18,9 @@ class Config:
 
     # Models
     WHISPER_MODEL = os.getenv("WHISPER_MODEL", "base")
+    # Optional persistent cache for model weights — keeps cold starts to a
+    # deserialize instead of a re-download (empty = backend default location)
+    WHISPER_CACHE_DIR = os.getenv("WHISPER_CACHE_DIR", "")
     AI_MODEL = os.getenv("AI_MODEL", "llama-3.3-70b-versatile")  # llama-3.3-70b-versatile, deepseek-chat, or gpt-3.5-turbo
     
     # Audio settings
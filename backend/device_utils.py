@@ -0,0 +1,22 @@
+"""
+Shared audio-device name classification
+Used by the diagnostic tools and smart_notes device pickers
+"""
+
+# Precompiled lowercase keyword tuples — checked against a name that is
+# lowercased exactly once per device
+_LOOPBACK_KEYS = ("stereo mix", "what you hear", "loopback")
+_MIC_KEYS = ("microphone", "mic")
+_SPEAKER_KEYS = ("output", "speaker", "stereo")
+
+
+def classify_device(name):
+    """Classify a device name as 'loopback', 'mic', 'speaker' or 'input'"""
+    name_lower = name.lower()
+    if any(k in name_lower for k in _LOOPBACK_KEYS):
+        return "loopback"
+    if any(k in name_lower for k in _MIC_KEYS):
+        return "mic"
+    if any(k in name_lower for k in _SPEAKER_KEYS):
+        return "speaker"
+    return "input"
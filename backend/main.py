@@ -166,6 +166,14 @@ class DeepSeekMeetingAssistant:
             self.is_running = False
             # FIX 17: Use .stop() instead of .stop_recording()
             self.audio.stop()
+
+            # Flush any audio still buffered in the transcriber's 30s window
+            tail = self.transcriber.flush()
+            if tail and len(tail.strip()) > 10:
+                timestamp = datetime.now().strftime("%H:%M")
+                self.transcript_display.append(f"[{timestamp}] {tail}")
+                self.ai.add_transcript_chunk(tail)
+
             self.generate_final_report()
             self.db.close()
             
@@ -28,6 +28,31 @@ class AudioSource(Enum):
     SPEAKER_OUTPUT = "speaker"
     BOTH = "both"
 
+class _AudioPool:
+    """Fixed pool of reusable float32 chunk buffers.
+
+    A 5-10s chunk at 16kHz is ~640KB; allocating a fresh array for every
+    chunk hammers the allocator over a long meeting. Capture threads grab
+    a free buffer, fill it and queue it; the consumer hands it back via
+    put() when done. If the pool runs dry we just allocate (old behavior).
+    """
+    def __init__(self, n, size):
+        self.size = size
+        self._free = queue.Queue()
+        for _ in range(n):
+            self._free.put(np.empty(size, dtype=np.float32))
+
+    def get(self):
+        try:
+            return self._free.get_nowait()
+        except queue.Empty:
+            return np.empty(self.size, dtype=np.float32)
+
+    def put(self, buf):
+        # Only recycle buffers that actually came from (or match) the pool
+        if isinstance(buf, np.ndarray) and buf.dtype == np.float32 and buf.size == self.size:
+            self._free.put(buf)
+
 class MeetingCapture:
     def __init__(self, source_type=AudioSource.SPEAKER_OUTPUT):
         self.source_type = source_type
@@ -177,6 +202,7 @@ class MeetingCapture:
         self.is_recording = True
         self.sample_rate = sample_rate
         self.chunk_size = sample_rate * chunk_duration
+        self._pool = _AudioPool(4, self.chunk_size)
 
         if capture_both:
             # Capture from BOTH microphone and speaker output
@@ -308,13 +334,19 @@ class MeetingCapture:
                 chunk_samples = int(actual_rate * chunk_duration)
                 audio_data = stream.read(chunk_samples, exception_on_overflow=False)
 
-                # Convert to numpy
-                audio_np = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32) / 32768.0
+                # Convert to numpy — reuse a pooled buffer on the common
+                # mono 16kHz path instead of allocating per chunk
+                audio_int16 = np.frombuffer(audio_data, dtype=np.int16)
+                if actual_rate == 16000 and audio_int16.size == self._pool.size:
+                    audio_np = self._pool.get()
+                    np.multiply(audio_int16, 1.0 / 32768.0, out=audio_np)
+                else:
+                    audio_np = audio_int16.astype(np.float32) / 32768.0
 
-                # Normalize volume
+                # Normalize volume (in place)
                 max_val = np.max(np.abs(audio_np))
                 if max_val > 0:
-                    audio_np = audio_np / max_val * 0.95
+                    audio_np *= 0.95 / max_val
 
                 # Noise gate
                 audio_np[np.abs(audio_np) < 0.01] = 0
@@ -549,6 +581,11 @@ class MeetingCapture:
         except queue.Empty:
             return None
 
+    def release_chunk(self, chunk):
+        """Hand a chunk back to the buffer pool once processing is done"""
+        if hasattr(self, '_pool'):
+            self._pool.put(chunk)
+
     def stop(self):
         """Stop recording"""
         self.is_recording = False
@@ -5,6 +5,7 @@ Enhanced AI summaries and better audio quality
 import os
 import time
 import threading
+import queue
 from datetime import datetime
 from pathlib import Path
 from rich.console import Console
@@ -17,6 +18,7 @@ import numpy as np
 import re
 from meeting_capture import MeetingCapture
 from simple_speaker_detection import SimpleSpeakerDetector
+from device_utils import classify_device
 import whisper
 from openai import OpenAI
 from dotenv import load_dotenv
@@ -64,12 +66,29 @@ class SmartNotesApp:
         self.whisper_model = None
         self.ai_client = None
         self.ai_model = None
+        self.local_llm = None  # Offline 4-bit fallback summarizer (llama-cpp)
         self.speaker_detector = SimpleSpeakerDetector()
         
         # Audio quality settings
         self.sample_rate = 16000  # Higher quality
         self.chunk_duration = 10   # Longer chunks for better context
 
+        # Shared transcribe settings — built once in load_ai_models so the
+        # per-chunk calls don't rebuild the same dict and prompt every time
+        self._whisper_kwargs = {}
+        self._base_prompt = ""
+        self._prev_tail = ""  # Last few words of the previous chunk, fed back as context
+
+        # Caption lines are printed from a dedicated thread so Rich's markup
+        # parsing and ANSI rendering never run on the inference thread
+        self._print_q = queue.Queue()
+        threading.Thread(target=self._print_loop, daemon=True).start()
+
+    def _print_loop(self):
+        """Drain queued caption lines to the console"""
+        while True:
+            self.console.print(self._print_q.get())
+
     def load_ai_models(self):
         """Load Whisper and LLM with better settings"""
         with Progress(
@@ -80,6 +99,19 @@ class SmartNotesApp:
             # Load Whisper with better model
             task1 = progress.add_task("Loading Whisper (base model for better accuracy)...", total=None)
             self.whisper_model = whisper.load_model("small")  # Using 'base' instead of 'tiny' for better quality
+            self._base_prompt = "This is a conversation, podcast, or meeting. People are speaking naturally in English. May include names, business terms, and expressions like 'happy', 'excited', 'thank you'."
+            self._prev_tail = ""
+            self._whisper_kwargs = {
+                "language": "en",       # Specify language for better accuracy
+                "fp16": False,          # Better quality on CPU
+                "temperature": 0.0,     # More deterministic
+                "best_of": 5,           # Try 5 different decodings
+                "beam_size": 5,         # Better search
+                # Context comes from a short rolling tail in initial_prompt
+                # instead — conditioning on the full history grows decoder
+                # cost over long meetings and can cascade hallucinations
+                "condition_on_previous_text": False
+            }
             progress.update(task1, description="✅ Whisper loaded")
 
             # Setup AI client
@@ -105,11 +137,31 @@ class SmartNotesApp:
                 
                 progress.update(task2, description="✅ AI connected")
             else:
-                progress.update(task2, description="⚠️ No AI key found (transcription only)")
+                # No API key — try a local 4-bit GGUF model so summaries
+                # still work offline (point LOCAL_LLM_GGUF at the file)
+                local_model_path = os.getenv("LOCAL_LLM_GGUF")
+                if local_model_path and self.local_llm is None:
+                    try:
+                        from llama_cpp import Llama
+                        self.local_llm = Llama(
+                            model_path=local_model_path,
+                            n_ctx=8192,
+                            n_threads=os.cpu_count(),
+                            n_gpu_layers=int(os.getenv("LOCAL_LLM_GPU_LAYERS", "0")),
+                            verbose=False
+                        )
+                        progress.update(task2, description="✅ Local AI model loaded (offline mode)")
+                    except Exception as e:
+                        self.console.print(f"[yellow]⚠️ Local model load failed: {e}[/yellow]")
+                        progress.update(task2, description="⚠️ No AI key found (transcription only)")
+                elif self.local_llm is not None:
+                    progress.update(task2, description="✅ Local AI model loaded (offline mode)")
+                else:
+                    progress.update(task2, description="⚠️ No AI key found (transcription only)")
 
     def generate_detailed_summary(self, transcript_items, duration_minutes=None):
         """Generate DETAILED summary based on discussion length and content"""
-        if not self.ai_client or not transcript_items:
+        if (not self.ai_client and not self.local_llm) or not transcript_items:
             return None
 
         try:
@@ -143,16 +195,27 @@ Provide:
 
 ## 🏆 QUALITY ASSESSMENT (Clarity, Productivity, Engagement scores)"""
 
-            response = self.ai_client.chat.completions.create(
-                model=self.ai_model,
-                messages=[
-                    {"role": "system", "content": "Expert meeting analyst. Be thorough and structured."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=max_tokens,
-                temperature=0.3
-            )
-            return response.choices[0].message.content
+            messages = [
+                {"role": "system", "content": "Expert meeting analyst. Be thorough and structured."},
+                {"role": "user", "content": prompt}
+            ]
+
+            if self.ai_client:
+                response = self.ai_client.chat.completions.create(
+                    model=self.ai_model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=0.3
+                )
+                return response.choices[0].message.content
+            else:
+                # Offline path — quantized local model, same prompt
+                out = self.local_llm.create_chat_completion(
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=0.3
+                )
+                return out["choices"][0]["message"]["content"]
 
         except Exception as e:
             self.console.print(f"[red]Error generating summary: {e}[/red]")
@@ -212,23 +275,22 @@ Provide:
                         # Enhanced transcription with better parameters
                         result = self.whisper_model.transcribe(
                             audio_chunk,
-                            language='en',  # Specify language for better accuracy
-                            fp16=False,     # Better quality on CPU
-                            temperature=0.0,  # More deterministic
-                            initial_prompt="This is a conversation, podcast, or meeting. People are speaking naturally in English. May include names, business terms, and expressions like 'happy', 'excited', 'thank you'.",
-                            best_of=5,      # Try 5 different decodings
-                            beam_size=5,    # Better search
-                            condition_on_previous_text=True  # Use context
+                            initial_prompt=(self._base_prompt + " " + self._prev_tail).strip(),
+                            **self._whisper_kwargs
                         )
                         text = result["text"].strip()
                         text = clean_transcription(text)
 
                         if text and len(text) > 3:  # Filter out noise
-                            timestamp = datetime.now().strftime("%H:%M:%S")
+                            self._prev_tail = " ".join(text.split()[-20:])
+                            now = datetime.now()
+                            timestamp = now.strftime("%H:%M:%S")
                             speaker = self.speaker_detector.detect_speaker(audio_chunk)
                             transcript.append({"time": timestamp, "speaker": speaker, "text": text})
 
-                            self.console.print(f"[dim]{timestamp}[/dim] [cyan]{speaker}:[/cyan] {text}")
+                            self._print_q.put(f"[dim]{timestamp}[/dim] [cyan]{speaker}:[/cyan] {text}")
+
+                        capture.release_chunk(audio_chunk)
             
             thread = threading.Thread(target=process_audio, daemon=True)
             thread.start()
@@ -268,8 +330,9 @@ Provide:
         for idx, device in enumerate(devices):
             device_name = device['name']
             channels = device.get('max_input_channels', 0)
-            device_type = "🎤 Microphone" if "microphone" in device_name.lower() else "🔊 Speaker" if "stereo" in device_name.lower() or "output" in device_name.lower() else "🎧 Audio Device"
-            
+            kind = classify_device(device_name)
+            device_type = "🎤 Microphone" if kind == "mic" else "🔊 Speaker" if kind in ("loopback", "speaker") else "🎧 Audio Device"
+
             self.console.print(f"  {idx}. {device_type} - {device_name}")
         
         device_index = IntPrompt.ask("\nSelect device number (choose a device that captures BOTH)", default=0)
@@ -296,22 +359,21 @@ Provide:
                     if audio_chunk is not None:
                         result = self.whisper_model.transcribe(
                             audio_chunk,
-                            language='en',
-                            fp16=False,
-                            temperature=0.0,
-                            initial_prompt="This is a conversation, podcast, or meeting. People are speaking naturally in English. May include names, business terms, and expressions like 'happy', 'excited', 'thank you'.",
-                            best_of=5,
-                            beam_size=5,
-                            condition_on_previous_text=True
+                            initial_prompt=(self._base_prompt + " " + self._prev_tail).strip(),
+                            **self._whisper_kwargs
                         )
                         text = result["text"].strip()
                         text = clean_transcription(text)
 
                         if text and len(text) > 3:
-                            timestamp = datetime.now().strftime("%H:%M:%S")
+                            self._prev_tail = " ".join(text.split()[-20:])
+                            now = datetime.now()
+                            timestamp = now.strftime("%H:%M:%S")
                             speaker = self.speaker_detector.detect_speaker(audio_chunk)
                             transcript.append({"time": timestamp, "speaker": speaker, "text": text})
-                            self.console.print(f"[dim]{timestamp}[/dim] [cyan]{speaker}:[/cyan] {text}")
+                            self._print_q.put(f"[dim]{timestamp}[/dim] [cyan]{speaker}:[/cyan] {text}")
+
+                        capture.release_chunk(audio_chunk)
             
             thread = threading.Thread(target=process_audio, daemon=True)
             thread.start()
@@ -337,48 +399,54 @@ Provide:
 
     def save_enhanced_notes(self, transcript, source_type, duration_minutes):
         """Save notes with detailed AI summary"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M")
+        now = datetime.now()  # One clock snapshot for the filename and header
+        timestamp = now.strftime("%Y%m%d_%H%M")
         filename = self.notes_folder / f"meeting_notes_{timestamp}.txt"
         
         # Generate detailed summary
         self.console.print("\n[cyan]Generating detailed AI summary...[/cyan]")
         summary = self.generate_detailed_summary(transcript, duration_minutes)
         
+        # Build the whole document in memory and write once — with long meetings
+        # (thousands of segments) this is much cheaper than per-line f.write calls
+        lines = []
+        lines.append("═" * 80 + "\n")
+        lines.append("   📝 MEETING NOTES - ENHANCED AI ANALYSIS\n")
+        lines.append("═" * 80 + "\n\n")
+
+        lines.append(f"📅 Date: {now.strftime('%B %d, %Y')}\n")
+        lines.append(f"🕐 Time: {now.strftime('%I:%M %p')}\n")
+        lines.append(f"🎙️  Source: {source_type}\n")
+        lines.append(f"⏱️  Duration: {duration_minutes:.1f} minutes\n")
+        lines.append(f"📊 Segments Captured: {len(transcript)}\n\n")
+
+        # AI Summary first (most important)
+        if summary:
+            lines.append("═" * 80 + "\n")
+            lines.append("🤖 DETAILED AI ANALYSIS\n")
+            lines.append("═" * 80 + "\n\n")
+            lines.append(summary + "\n\n")
+
+        # Full transcript after
+        lines.append("═" * 80 + "\n")
+        lines.append("📋 COMPLETE TRANSCRIPT\n")
+        lines.append("═" * 80 + "\n\n")
+
+        current_speaker = None
+        for item in transcript:
+            speaker = item.get("speaker", "Unknown")
+            if speaker != current_speaker:
+                lines.append(f"\n{speaker}:\n")
+                current_speaker = speaker
+            lines.append(f"  [{item['time']}] {item['text']}\n")
+
+        lines.append("\n" + "═" * 80 + "\n")
+        lines.append("Generated by Smart Meeting Notes - Enhanced Edition\n")
+        lines.append(f"File: {filename.name}\n")
+        lines.append("═" * 80 + "\n")
+
         with open(filename, 'w', encoding='utf-8') as f:
-            f.write("═" * 80 + "\n")
-            f.write("   📝 MEETING NOTES - ENHANCED AI ANALYSIS\n")
-            f.write("═" * 80 + "\n\n")
-            
-            f.write(f"📅 Date: {datetime.now().strftime('%B %d, %Y')}\n")
-            f.write(f"🕐 Time: {datetime.now().strftime('%I:%M %p')}\n")
-            f.write(f"🎙️  Source: {source_type}\n")
-            f.write(f"⏱️  Duration: {duration_minutes:.1f} minutes\n")
-            f.write(f"📊 Segments Captured: {len(transcript)}\n\n")
-            
-            # AI Summary first (most important)
-            if summary:
-                f.write("═" * 80 + "\n")
-                f.write("🤖 DETAILED AI ANALYSIS\n")
-                f.write("═" * 80 + "\n\n")
-                f.write(summary + "\n\n")
-            
-            # Full transcript after
-            f.write("═" * 80 + "\n")
-            f.write("📋 COMPLETE TRANSCRIPT\n")
-            f.write("═" * 80 + "\n\n")
-            
-            current_speaker = None
-            for item in transcript:
-                speaker = item.get("speaker", "Unknown")
-                if speaker != current_speaker:
-                    f.write(f"\n{speaker}:\n")
-                    current_speaker = speaker
-                f.write(f"  [{item['time']}] {item['text']}\n")
-            
-            f.write("\n" + "═" * 80 + "\n")
-            f.write("Generated by Smart Meeting Notes - Enhanced Edition\n")
-            f.write(f"File: {filename.name}\n")
-            f.write("═" * 80 + "\n")
+            f.write(''.join(lines))
         
         self.console.print(f"\n✅ [green]Enhanced notes saved![/green]")
         self.console.print(f"📄 Location: {filename}")
@@ -460,13 +528,12 @@ Provide:
             try:
                 result = self.whisper_model.transcribe(
                     file_path,
-                    language='en',
-                    fp16=False,
-                    temperature=0.0,
-                    initial_prompt="This is a conversation, podcast, or meeting. People are speaking naturally in English. May include names, business terms, and expressions like 'happy', 'excited', 'thank you'.",
-                    best_of=5,
-                    beam_size=5,
-                    condition_on_previous_text=True
+                    initial_prompt=self._base_prompt,
+                    # Whole files keep Whisper's own cross-window context:
+                    # the rolling-tail prompt replaces it only for live
+                    # chunks, where unbounded history grows decoder cost
+                    # and can cascade hallucinations across a long meeting
+                    **{**self._whisper_kwargs, "condition_on_previous_text": True}
                 )
                 text = clean_transcription(result["text"])
                 
@@ -476,7 +543,7 @@ Provide:
                 progress.update(task, description="✅ Transcription complete")
                 
                 # Generate enhanced summary
-                if self.ai_client:
+                if self.ai_client or self.local_llm:
                     task2 = progress.add_task("Generating detailed analysis...", total=None)
                     summary = self.generate_detailed_summary(transcript_items)
                     progress.update(task2, description="✅ Analysis complete")
@@ -4,6 +4,14 @@ Tests your audio devices and provides setup guidance
 """
 import pyaudio
 import numpy as np
+from device_utils import classify_device
+
+# Recording parameters for test_device, hoisted to module scope
+SR = 16000
+CHUNK = 1024
+SECONDS = 3
+N_FRAMES = SR * SECONDS // CHUNK
+FMT = pyaudio.paInt16
 
 def list_all_devices():
     """List all audio devices with detailed info"""
@@ -32,11 +40,11 @@ def list_all_devices():
             print(f"    Default sample rate: {int(info['defaultSampleRate'])} Hz")
 
             if max_in > 0:
-                name_lower = name.lower()
-                if "stereo mix" in name_lower or "what you hear" in name_lower:
+                kind = classify_device(name)
+                if kind == "loopback":
                     speakers_input.append((i, name, "STEREO MIX"))
                     print(f"    >> Type: STEREO MIX (captures speaker output)")
-                elif "microphone" in name_lower or "mic" in name_lower:
+                elif kind == "mic":
                     microphones.append((i, name, "MICROPHONE"))
                     print(f"    >> Type: MICROPHONE")
                 else:
@@ -87,30 +95,31 @@ def test_device(device_index):
 
         # Try to open stream
         stream = p.open(
-            format=pyaudio.paInt16,
+            format=FMT,
             channels=1,
-            rate=16000,
+            rate=SR,
             input=True,
             input_device_index=device_index,
-            frames_per_buffer=1024
+            frames_per_buffer=CHUNK
         )
 
         print(">> Stream opened successfully!")
         print(">> Recording...")
 
-        # Record for 3 seconds
-        frames = []
-        for _ in range(0, int(16000 / 1024 * 3)):
-            data = stream.read(1024, exception_on_overflow=False)
-            frames.append(data)
+        # Record for 3 seconds straight into a preallocated buffer —
+        # avoids growing a frames list and the b''.join copy at the end
+        audio_data = np.empty(N_FRAMES * CHUNK, dtype=np.int16)
+        for i in range(N_FRAMES):
+            data = stream.read(CHUNK, exception_on_overflow=False)
+            audio_data[i * CHUNK:(i + 1) * CHUNK] = np.frombuffer(data, dtype=np.int16)
 
         stream.stop_stream()
         stream.close()
 
-        # Analyze audio
-        audio_data = np.frombuffer(b''.join(frames), dtype=np.int16)
-        max_amplitude = np.max(np.abs(audio_data))
-        avg_amplitude = np.mean(np.abs(audio_data))
+        # Analyze audio — take abs() once and derive both stats from it
+        abs_amplitude = np.abs(audio_data)
+        max_amplitude = abs_amplitude.max()
+        avg_amplitude = abs_amplitude.mean()
 
         print(f"\nAudio Analysis:")
         print(f"   Max amplitude: {max_amplitude}")
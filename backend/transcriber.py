@@ -1,93 +1,299 @@
-import whisper
+import os
+import re
+import threading
+import concurrent.futures
 import numpy as np
+import httpx
 from openai import OpenAI
 from config import Config
 
+# Prefer faster-whisper (CTranslate2, INT8) — ~4x faster on CPU with the same
+# accuracy. Fall back to the reference openai-whisper if it isn't installed.
+try:
+    from faster_whisper import WhisperModel
+    USING_FASTER_WHISPER = True
+    print("✅ Using faster-whisper (CTranslate2 INT8 backend)")
+except ImportError:
+    import whisper
+    USING_FASTER_WHISPER = False
+    print("ℹ️  Using openai-whisper (install faster-whisper for ~4x CPU speedup)")
+
+# Models and API clients are heavyweight — cache them at module scope so
+# re-instantiating Transcriber never reloads the same model (each reload
+# costs seconds and leaks the previous copy until GC catches up). The model
+# cache holds the load *future*, inserted before the load starts, so a
+# Transcriber constructed while the first load is still in flight shares it
+# instead of kicking off a second multi-GB load.
+_MODEL_CACHE = {}
+_MODEL_LOCK = threading.Lock()
+_GROQ_CLIENT_CACHE = {}
+
+# Single shared loader thread — a per-instance executor would leak one
+# never-shut-down thread per construction
+_LOAD_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+def _cuda_available():
+    """Probe for a usable CUDA device (torch may not be installed)"""
+    try:
+        import torch
+    except ImportError:
+        return False
+    if torch.cuda.is_available():
+        torch.backends.cuda.matmul.allow_tf32 = True  # TF32 matmuls on Ampere+
+        return True
+    return False
+
+# Prompt templates, hoisted so the hot correction path only pays .format()
+_CORRECTION_PROMPT = """You are correcting a speech-to-text transcription error.
+
+Full transcript context:
+"{context}"
+
+The following phrase was transcribed with low confidence and may be wrong:
+"{text}"
+
+Based on the context, what did the speaker most likely say?
+Reply with ONLY the corrected phrase — no explanation, no quotes, just the corrected text.
+If the original seems fine, return it as-is."""
+
+_BATCH_CORRECTION_PROMPT = """You are correcting speech-to-text transcription errors.
+
+Full transcript context:
+"{context}"
+
+Each numbered phrase below was transcribed with low confidence and may be wrong.
+Based on the context, what did the speaker most likely say for each one?
+Reply with ONLY the corrected phrases, one line per input, keeping the same
+numbering — no explanation, no quotes. If a phrase seems fine, return it as-is.
+
+{numbered}"""
+
 class Transcriber:
+    # Whisper pads every call to a 30s mel window, so transcribing 5s
+    # chunks pays ~6x the encoder FLOPs per real second. Incoming audio is
+    # accumulated to this natural window size before inference.
+    SAMPLE_RATE = 16000
+    WINDOW_SAMPLES = 30 * SAMPLE_RATE
+
     def __init__(self):
         self.config = Config()
-        self.model = None
         self.groq_client = None
 
         # Confidence threshold — segments below this get sent for correction
         self.CONFIDENCE_THRESHOLD = -0.8  # Whisper uses log probabilities (0 = perfect, -1 = uncertain)
 
-        try:
-            print(f"🔄 Loading Whisper model ({self.config.WHISPER_MODEL})...")
-            self.model = whisper.load_model(self.config.WHISPER_MODEL)
-            print("✅ Whisper model loaded")
-        except Exception as e:
-            print(f"❌ Failed to load Whisper model: {e}")
-            raise
+        # GPU inference is an order of magnitude faster than CPU and FP16
+        # is the supported precision there. whisper.transcribe forces FP32
+        # on CPU regardless of the flag, so _fp16 tracks CUDA only;
+        # faster-whisper takes its CPU precision via compute_type at load
+        # time, and the openai-whisper fallback reads self._fp16 per call.
+        self._use_cuda = _cuda_available()
+        self._fp16 = self._use_cuda
+
+        # Rolling buffer that accumulates chunks up to WINDOW_SAMPLES
+        self._window_buf = np.empty(0, dtype=np.float32)
+
+        # Kick off the model load in the background — it takes seconds and
+        # nothing before the first transcribe call actually needs it, so
+        # Groq setup and the rest of app startup overlap with the load
+        model_name = self.config.WHISPER_MODEL
+        self._model = None
+        with _MODEL_LOCK:
+            self._model_future = _MODEL_CACHE.get(model_name)
+            if self._model_future is None:
+                print(f"🔄 Loading Whisper model ({model_name}) in background...")
+                self._model_future = _LOAD_POOL.submit(self._load_model, model_name)
+                _MODEL_CACHE[model_name] = self._model_future
+            else:
+                print(f"✅ Whisper model ({model_name}) reused from cache")
 
-        # Setup Groq for correction
+        # Setup Groq for correction — one client per API key, shared
         try:
             if self.config.GROQ_API_KEY:
-                self.groq_client = OpenAI(
-                    api_key=self.config.GROQ_API_KEY,
-                    base_url="https://api.groq.com/openai/v1"
-                )
+                key = self.config.GROQ_API_KEY
+                if key not in _GROQ_CLIENT_CACHE:
+                    # Explicit pool with generous keepalive so concurrent
+                    # corrections reuse warm TLS connections
+                    _GROQ_CLIENT_CACHE[key] = OpenAI(
+                        api_key=key,
+                        base_url="https://api.groq.com/openai/v1",
+                        http_client=httpx.Client(
+                            limits=httpx.Limits(
+                                max_keepalive_connections=16,
+                                max_connections=32
+                            ),
+                            timeout=10.0
+                        )
+                    )
+                self.groq_client = _GROQ_CLIENT_CACHE[key]
                 print("✅ Groq correction layer ready")
             else:
                 print("⚠️  No Groq key — correction layer disabled")
         except Exception as e:
             print(f"⚠️  Groq setup failed: {e}")
 
+    @property
+    def model(self):
+        """The loaded Whisper model — blocks until the background load finishes"""
+        if self._model is None:
+            self._model = self._model_future.result()
+        return self._model
+
+    def _load_model(self, model_name):
+        """Backend-specific model load; runs on the loader thread"""
+        try:
+            cache_dir = self.config.WHISPER_CACHE_DIR or None
+            device = "cuda" if self._use_cuda else "cpu"
+            if USING_FASTER_WHISPER:
+                model = WhisperModel(
+                    model_name,
+                    device=device,
+                    # FP16 on GPU, dynamic INT8 quantization on CPU
+                    compute_type="float16" if self._use_cuda else "int8",
+                    cpu_threads=os.cpu_count(),
+                    download_root=cache_dir
+                )
+            else:
+                model = whisper.load_model(
+                    model_name, device=device, download_root=cache_dir)
+            print("✅ Whisper model loaded")
+            return model
+        except Exception as e:
+            print(f"❌ Failed to load Whisper model: {e}")
+            # Drop the failed future so the next construction can retry
+            with _MODEL_LOCK:
+                _MODEL_CACHE.pop(model_name, None)
+            raise
+
+    # ─────────────────────────────────────────────
+    # BACKEND ADAPTER — normalizes both Whisper APIs
+    # ─────────────────────────────────────────────
+    def _run_whisper(self, audio, word_timestamps=True):
+        """Run the loaded backend, returning (full_text, segment dicts).
+
+        Segments always expose 'text', 'avg_logprob' and 'no_speech_prob'
+        so the confidence logic downstream is backend-agnostic.
+        """
+        if USING_FASTER_WHISPER:
+            segments, _info = self.model.transcribe(
+                audio,
+                language='en',
+                word_timestamps=word_timestamps,
+                vad_filter=True
+            )
+            seg_dicts = [{
+                'text': seg.text,
+                'avg_logprob': seg.avg_logprob,
+                'no_speech_prob': seg.no_speech_prob
+            } for seg in segments]
+            full_text = ' '.join(s['text'].strip() for s in seg_dicts)
+            return full_text, seg_dicts
+
+        result = self.model.transcribe(
+            audio,
+            fp16=self._fp16,
+            language='en',
+            word_timestamps=word_timestamps,
+            verbose=False
+        )
+        return result['text'], result.get('segments', [])
+
     # ─────────────────────────────────────────────
     # MAIN METHOD — called during live capture
     # ─────────────────────────────────────────────
     def transcribe_audio(self, audio_data):
-        """Transcribe audio with confidence scoring and auto-correction"""
+        """Transcribe audio with confidence scoring and auto-correction.
+
+        Chunks are buffered until a full 30s window is available; partial
+        windows return "" and are picked up by the next call (or flush()).
+        """
         if audio_data is None or len(audio_data) == 0:
             return ""
 
-        try:
-            # Get full result including segment-level data
-            result = self.model.transcribe(
-                audio_data,
-                fp16=False,
-                language='en',
-                word_timestamps=True,      # Enable word-level timestamps
-                verbose=False
-            )
+        self._window_buf = np.concatenate(
+            (self._window_buf, np.asarray(audio_data, dtype=np.float32)))
+        if len(self._window_buf) < self.WINDOW_SAMPLES:
+            return ""
 
-            segments = result.get('segments', [])
+        window = self._window_buf[:self.WINDOW_SAMPLES]
+        self._window_buf = self._window_buf[self.WINDOW_SAMPLES:]
+        return self._transcribe_window(window)
+
+    def flush(self):
+        """Transcribe whatever audio is still buffered (call at meeting end)"""
+        if len(self._window_buf) == 0:
+            return ""
+        window = self._window_buf
+        self._window_buf = np.empty(0, dtype=np.float32)
+        return self._transcribe_window(window)
+
+    def _transcribe_window(self, audio_data):
+        """Run one full window through Whisper + the correction layer"""
+        # Cheap energy gate — don't pay for the encoder on silence.
+        # (faster-whisper additionally runs its own VAD via vad_filter.)
+        rms = float(np.sqrt(np.mean(np.square(audio_data, dtype=np.float32))))
+        if rms < 0.005:
+            return ""
+
+        try:
+            # Get full result including segment-level data. Word timestamps
+            # stay off — only segment-level confidence is consumed here, and
+            # the word-level DTW alignment costs real time per chunk
+            full_text, segments = self._run_whisper(audio_data, word_timestamps=False)
 
             if not segments:
-                return result['text'].strip()
+                return full_text.strip()
+
+            # Vectorized triage — compute keep/flag masks in one sweep over
+            # SoA confidence arrays instead of per-dict Python comparisons
+            n = len(segments)
+            logp = np.fromiter(
+                (s.get('avg_logprob', 0.0) for s in segments), np.float32, count=n)
+            nsp = np.fromiter(
+                (s.get('no_speech_prob', 0.0) for s in segments), np.float32, count=n)
+            keep = nsp <= 0.6  # Skip segments that are probably not speech
+            if self.groq_client:
+                flag = keep & (logp < self.CONFIDENCE_THRESHOLD)
+            else:
+                # No corrector available — [?] markers would never get
+                # resolved, so skip the flag bookkeeping and emit raw text
+                flag = np.zeros(n, dtype=bool)
 
-            # Process each segment, flag low confidence ones
             final_parts = []
+            clean_parts = []  # Same text without [?] markers, for context
             flagged_parts = []
 
-            for seg in segments:
-                text = seg['text'].strip()
-                avg_logprob = seg.get('avg_logprob', 0)
-                no_speech_prob = seg.get('no_speech_prob', 0)
-
-                # Skip if it's probably not speech at all
-                if no_speech_prob > 0.6:
+            for i, seg in enumerate(segments):
+                if not keep[i]:
                     continue
-
-                if avg_logprob < self.CONFIDENCE_THRESHOLD:
+                text = seg['text'].strip()
+                clean_parts.append(text)
+                if flag[i]:
                     # Low confidence — mark for correction
                     flagged_parts.append({
                         'text': text,
-                        'confidence': avg_logprob,
+                        'confidence': float(logp[i]),
                         'index': len(final_parts)
                     })
                     final_parts.append(f"[?]{text}[/?]")  # Placeholder
-                    print(f"⚠️  Low confidence segment (score: {avg_logprob:.2f}): '{text}'")
+                    print(f"⚠️  Low confidence segment (score: {logp[i]:.2f}): '{text}'")
                 else:
                     final_parts.append(text)
 
             # If there are flagged parts and Groq is available, correct them
+            # all in one request — network round-trips dominate this path
             if flagged_parts and self.groq_client:
-                full_context = ' '.join(p.replace('[?]', '').replace('[/?]', '') 
-                                       for p in final_parts)
-                
-                for flagged in flagged_parts:
-                    corrected = self._correct_with_groq(flagged['text'], full_context)
+                full_context = ' '.join(clean_parts)
+
+                corrections = None
+                if len(flagged_parts) > 1:
+                    corrections = self._correct_batch_with_groq(flagged_parts, full_context)
+
+                for i, flagged in enumerate(flagged_parts):
+                    corrected = corrections[i] if corrections else None
+                    if not corrected:
+                        # Single-item fallback (also the n=1 path)
+                        corrected = self._correct_with_groq(flagged['text'], full_context)
                     if corrected:
                         final_parts[flagged['index']] = corrected
                         print(f"✅ Corrected: '{flagged['text']}' → '{corrected}'")
@@ -101,20 +307,44 @@ class Transcriber:
     # ─────────────────────────────────────────────
     # CORRECTION LAYER — Groq fixes bad segments
     # ─────────────────────────────────────────────
-    def _correct_with_groq(self, uncertain_text, full_context):
-        """Send low-confidence segment to Groq for correction"""
+    def _correct_batch_with_groq(self, flagged_parts, full_context):
+        """Correct all flagged segments in a single Groq request.
+
+        Collapses N HTTP round-trips into one and sends the context prefix
+        once. Returns a list aligned with flagged_parts (None where the
+        reply didn't cover an item), or None if the whole call failed.
+        """
         try:
-            prompt = f"""You are correcting a speech-to-text transcription error.
+            numbered = '\n'.join(f"{i + 1}. {f['text']}" for i, f in enumerate(flagged_parts))
+            prompt = _BATCH_CORRECTION_PROMPT.format(context=full_context, numbered=numbered)
 
-Full transcript context:
-"{full_context}"
+            response = self.groq_client.chat.completions.create(
+                model=self.config.AI_MODEL,
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=100 * len(flagged_parts),
+                temperature=0.1
+            )
 
-The following phrase was transcribed with low confidence and may be wrong:
-"{uncertain_text}"
+            content = response.choices[0].message.content
+            corrections = [None] * len(flagged_parts)
+            for match in re.finditer(r'^\s*(\d+)[.)]\s*(.+)$', content, re.MULTILINE):
+                idx = int(match.group(1)) - 1
+                if 0 <= idx < len(corrections):
+                    corrected = match.group(2).strip()
+                    # Same sanity check as the single-item path
+                    if len(corrected) <= len(flagged_parts[idx]['text']) * 3:
+                        corrections[idx] = corrected
 
-Based on the context, what did the speaker most likely say? 
-Reply with ONLY the corrected phrase — no explanation, no quotes, just the corrected text.
-If the original seems fine, return it as-is."""
+            return corrections
+
+        except Exception as e:
+            print(f"⚠️  Groq batch correction failed: {e}")
+            return None
+
+    def _correct_with_groq(self, uncertain_text, full_context):
+        """Send low-confidence segment to Groq for correction"""
+        try:
+            prompt = _CORRECTION_PROMPT.format(context=full_context, text=uncertain_text)
 
             response = self.groq_client.chat.completions.create(
                 model=self.config.AI_MODEL,
@@ -143,26 +373,21 @@ If the original seems fine, return it as-is."""
         if audio_data is None or len(audio_data) == 0:
             return {"transcript": "", "stats": {}}
 
-        result = self.model.transcribe(
-            audio_data,
-            fp16=False,
-            language='en',
-            word_timestamps=True
-        )
-
-        segments = result.get('segments', [])
+        full_text, segments = self._run_whisper(audio_data, word_timestamps=True)
         if not segments:
-            return {"transcript": result['text'], "stats": {}}
+            return {"transcript": full_text, "stats": {}}
 
-        confidences = [s.get('avg_logprob', 0) for s in segments]
-        low_conf_count = sum(1 for c in confidences if c < self.CONFIDENCE_THRESHOLD)
+        # One array, one vectorized pass for both the count and the mean
+        confidences = np.fromiter(
+            (s.get('avg_logprob', 0.0) for s in segments), np.float32, count=len(segments))
+        low_conf_count = int((confidences < self.CONFIDENCE_THRESHOLD).sum())
 
         return {
-            "transcript": result['text'].strip(),
+            "transcript": full_text.strip(),
             "stats": {
                 "total_segments": len(segments),
                 "low_confidence_segments": low_conf_count,
-                "avg_confidence": round(np.mean(confidences), 3),
+                "avg_confidence": round(float(confidences.mean()), 3),
                 "quality_score": round((1 - low_conf_count / max(len(segments), 1)) * 100, 1)
             }
         }
@@ -172,13 +397,13 @@ If the original seems fine, return it as-is."""
     # ─────────────────────────────────────────────
     def transcribe_file(self, filename):
         """Transcribe uploaded audio file with correction"""
-        result = self.model.transcribe(filename, word_timestamps=True)
-        segments = result.get('segments', [])
+        full_text, segments = self._run_whisper(filename, word_timestamps=False)
 
         if not segments:
-            return result['text']
+            return full_text
 
         final_parts = []
+        flagged = []  # (index into final_parts, original text)
         for seg in segments:
             text = seg['text'].strip()
             avg_logprob = seg.get('avg_logprob', 0)
@@ -188,10 +413,17 @@ If the original seems fine, return it as-is."""
                 continue
 
             if avg_logprob < self.CONFIDENCE_THRESHOLD and self.groq_client:
-                full_context = result['text']
-                corrected = self._correct_with_groq(text, full_context)
-                final_parts.append(corrected)
-            else:
-                final_parts.append(text)
+                flagged.append((len(final_parts), text))
+            final_parts.append(text)
+
+        # Corrections are independent I/O-bound calls — fan them out so
+        # wall time is max(latency) instead of sum(latency)
+        if flagged:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+                corrected = list(executor.map(
+                    lambda f: self._correct_with_groq(f[1], full_text), flagged))
+            for (pos, _), new_text in zip(flagged, corrected):
+                if new_text:
+                    final_parts[pos] = new_text
 
         return ' '.join(final_parts).strip()
\ No newline at end of file
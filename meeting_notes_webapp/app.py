@@ -3,16 +3,39 @@
 import os
 os.environ["PATH"] = r"C:\ProgramData\chocolatey\bin" + os.pathsep + os.environ.get("PATH", "")
 
+import io
+import re
 import json
 import time
 import threading
+import queue
+import logging
+import sqlite3
+import atexit
+import hashlib
+import concurrent.futures
 from datetime import datetime
 from pathlib import Path
 from flask import Flask, render_template, request, jsonify, send_file
 from flask_socketio import SocketIO, emit
 from flask_cors import CORS
-import whisper
 from openai import OpenAI
+
+# Prefer faster-whisper (CTranslate2, INT8) — 3-5x lower latency per chunk
+# on CPU. Fall back to the reference openai-whisper if it isn't installed.
+try:
+    from faster_whisper import WhisperModel
+    USING_FASTER_WHISPER = True
+    print("✅ Using faster-whisper (CTranslate2 INT8 backend)")
+    try:
+        from faster_whisper import BatchedInferencePipeline
+    except ImportError:  # older faster-whisper without batched decoding
+        BatchedInferencePipeline = None
+except ImportError:
+    import whisper
+    USING_FASTER_WHISPER = False
+    BatchedInferencePipeline = None
+    print("ℹ️  Using openai-whisper (install faster-whisper for ~4x CPU speedup)")
 try:
     import pyaudiowpatch as pyaudio
 except ImportError:
@@ -21,6 +44,20 @@ import numpy as np
 from werkzeug.utils import secure_filename
 from dotenv import load_dotenv
 
+# orjson parses JSON ~2-5x faster than the stdlib (matters on long
+# transcripts); fall back silently when it isn't installed
+try:
+    import orjson
+    def _json_loads(s):
+        return orjson.loads(s)
+    def _json_dumps(data):
+        return orjson.dumps(data).decode('utf-8')
+except ImportError:
+    def _json_loads(s):
+        return json.loads(s)
+    def _json_dumps(data):
+        return json.dumps(data)
+
 # Try to import VAD libraries, but don't fail if they're missing
 VAD_AVAILABLE = False
 try:
@@ -36,6 +73,13 @@ except ImportError as e:
 
 load_dotenv()
 
+# Hot-path diagnostics (per audio chunk) go through a logger with lazy
+# %-formatting: at the default INFO level the messages are never built,
+# so the per-chunk string formatting cost disappears. Set LOG_LEVEL=DEBUG
+# to get the old chunk-by-chunk output back.
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
+log = logging.getLogger("meeting")
+
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your-secret-key-here'
 app.config['UPLOAD_FOLDER'] = 'uploads'
@@ -48,36 +92,63 @@ Path(app.config['NOTES_FOLDER']).mkdir(exist_ok=True)
 socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
 CORS(app)
 
-recording_active = False
-recording_paused = False
+# Recording lifecycle as events instead of polled boolean globals: threads
+# observe stop/pause through wait()/is_set() without racing on plain flag
+# flips, and the paused capture thread can be woken immediately by stop.
+_stop_evt = threading.Event()
+_stop_evt.set()  # not recording until start_recording clears it
+_pause_evt = threading.Event()
 recording_thread = None
 audio_stream = None
 live_transcript = []
+# Kept in lockstep with live_transcript so generate_summary can join flat
+# string lists instead of re-running f-strings over every entry dict on
+# each request — O(N) formatting happens once, at append time.
+live_transcript_lines = []   # preformatted "[HH:MM:SS] text"
+live_transcript_texts = []   # bare text, for the LLM prompt
+
+# One shared PortAudio handle. pyaudio.PyAudio() probes every host API and
+# device on construction (100-500ms on Windows), so routes reuse a single
+# lazily-created instance instead of paying init+terminate per request.
+_pa = None
+
+def pa():
+    global _pa
+    if _pa is None:
+        _pa = pyaudio.PyAudio()
+        atexit.register(_pa.terminate)
+    return _pa
+
+# Shared pool for AI-provider network calls: every analysis request runs
+# through it, so file-upload and live-summary workflows proceed
+# concurrently while total in-flight provider calls stay capped at 8
+_LLM_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=8)
 
 class BasicNoiseFilter:
     """Basic noise filtering without external libraries"""
 
     def __init__(self):
         self.noise_threshold = 0.005  # Reduced from 0.01 for better sensitivity
+        # Same threshold expressed in raw int16 amplitude, so byte input can
+        # be gated without converting the whole chunk to float first
+        self._int16_threshold = int(self.noise_threshold * 32768)
 
     def is_speech(self, audio_data):
         """Simple volume-based speech detection"""
         if isinstance(audio_data, bytes):
-            audio_np = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32) / 32768.0
-        else:
-            audio_np = audio_data
+            # Compare in the int16 domain; abs in int32 to avoid overflow at -32768
+            audio_int16 = np.frombuffer(audio_data, dtype=np.int16)
+            return np.abs(audio_int16, dtype=np.int32).mean() > self._int16_threshold
 
-        # Check if audio is loud enough
-        volume = np.mean(np.abs(audio_np))
-        print(f"🔍 BasicNoiseFilter - Volume: {volume:.4f}, Threshold: {self.noise_threshold}")
-        return volume > self.noise_threshold
+        # Float arrays are already normalized — check directly
+        return np.mean(np.abs(audio_data)) > self.noise_threshold
 
     def process_audio(self, audio_chunk):
         """Basic processing - just volume check"""
         if self.is_speech(audio_chunk):
-            print("✅ BasicNoiseFilter - Speech detected")
+            log.debug("BasicNoiseFilter - speech detected")
             return audio_chunk
-        print("⚠️  BasicNoiseFilter - No speech detected")
+        log.debug("BasicNoiseFilter - no speech detected")
         return None
 
 class AdvancedNoiseSuppressionProcessor:
@@ -103,59 +174,157 @@ class AdvancedNoiseSuppressionProcessor:
             else:
                 audio_bytes = audio_data_bytes
 
+            frame_bytes = frame_size * 2
+            total_frames = len(audio_bytes) // frame_bytes
+            if total_frames == 0:
+                return False
+
+            # Decide yes as soon as 5% of the frames are speech — no need to
+            # run the VAD over the rest of the chunk once that's settled.
+            # memoryview slices avoid copying each 30ms frame out of the buffer.
+            needed = max(1, int(total_frames * 0.05) + 1)
+            buf = memoryview(audio_bytes)
             speech_frames = 0
-            total_frames = 0
-
-            for i in range(0, len(audio_bytes) - frame_size * 2, frame_size * 2):
-                frame = audio_bytes[i:i + frame_size * 2]
-                if len(frame) == frame_size * 2:
-                    try:
-                        if self.vad.is_speech(frame, sample_rate):
-                            speech_frames += 1
-                        total_frames += 1
-                    except:
-                        continue
-
-            if total_frames > 0:
-                speech_ratio = speech_frames / total_frames
-                print(f"🔍 AdvancedVAD - Speech ratio: {speech_ratio:.2%} ({speech_frames}/{total_frames} frames)")
-                return speech_ratio > 0.05  # Reduced to 5% for much better sensitivity
+
+            for i in range(total_frames):
+                try:
+                    if self.vad.is_speech(buf[i * frame_bytes:(i + 1) * frame_bytes], sample_rate):
+                        speech_frames += 1
+                        if speech_frames >= needed:
+                            log.debug("AdvancedVAD - speech confirmed after %d/%d frames",
+                                      i + 1, total_frames)
+                            return True
+                except:
+                    continue
+
+            log.debug("AdvancedVAD - no speech (%d/%d frames)", speech_frames, total_frames)
             return False
 
         except Exception as e:
-            print(f"⚠️  VAD error: {e}, assuming speech")
+            log.debug("VAD error: %s, assuming speech", e)
             return True  # If error, assume speech
     
+    def calibrate(self, audio_chunk):
+        """Cache a noise spectrum from a non-speech chunk"""
+        try:
+            _f, _t, spec = scipy_signal.stft(audio_chunk, fs=self.sample_rate, nperseg=512)
+            self.noise_profile = np.mean(np.abs(spec), axis=1, keepdims=True)
+            self.calibration_complete = True
+            log.debug("Noise profile calibrated from %d samples", len(audio_chunk))
+        except Exception as e:
+            log.debug("Noise calibration failed: %s", e)
+
     def reduce_noise(self, audio_chunk):
-        """Apply noise reduction"""
+        """Spectral gating against the cached noise profile.
+
+        nr.reduce_noise re-estimates the noise spectrum on every chunk;
+        with a profile cached once from a silent chunk, each call is a
+        single STFT/ISTFT pair instead.
+        """
+        if self.noise_profile is None:
+            return audio_chunk
+
         try:
-            reduced_audio = nr.reduce_noise(
-                y=audio_chunk,
-                sr=self.sample_rate,
-                stationary=True,
-                prop_decrease=0.8
-            )
-            return reduced_audio
-        except:
+            _f, _t, spec = scipy_signal.stft(audio_chunk, fs=self.sample_rate, nperseg=512)
+            mag = np.abs(spec)
+            phase = spec / (mag + 1e-10)
+            # Subtract the noise floor, keeping 20% of the original magnitude
+            # (matches the old prop_decrease=0.8 behaviour)
+            gated = np.maximum(mag - self.noise_profile, 0.2 * mag)
+            _t, cleaned = scipy_signal.istft(gated * phase, fs=self.sample_rate, nperseg=512)
+            return cleaned[:len(audio_chunk)].astype(np.float32)
+        except Exception:
             return audio_chunk
-    
+
     def process_audio(self, audio_chunk):
         """Process with VAD and noise reduction"""
         if not self.is_speech(audio_chunk, self.sample_rate):
+            # Silent chunks are free calibration material
+            if not self.calibration_complete:
+                self.calibrate(audio_chunk)
             return None
-        
+
         return self.reduce_noise(audio_chunk)
 
+# Whisper's classic failure mode on near-silent audio is degenerate output:
+# either a looped phrase or boilerplate from its pretraining data ("thanks
+# for watching"). Both checks cost microseconds and keep junk transcripts
+# from being stored and fed to the LLM.
+_BOILERPLATE = {
+    "thanks for watching",
+    "thank you for watching",
+    "thanks for listening",
+    "please subscribe",
+    "please like and subscribe",
+    "subtitles by the amara.org community",
+    "thank you",
+    "you",
+    "bye",
+}
+
+def _has_ngram_repeat(text, n=4, thresh=3):
+    """True if any word n-gram occurs `thresh` or more times (loop output)"""
+    words = text.lower().split()
+    if len(words) < n * thresh:
+        return False
+
+    counts = {}
+    for i in range(len(words) - n + 1):
+        gram = tuple(words[i:i + n])
+        seen = counts.get(gram, 0) + 1
+        if seen >= thresh:
+            return True
+        counts[gram] = seen
+    return False
+
+# Compiled once; with maxsplit the fallback only scans as far as the third
+# sentence boundary instead of splitting the entire transcript
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+
+# Groq model tiers: "instant" trades some quality for ~2x throughput and
+# ~3x lower time-to-first-token, suited to short latency-critical
+# extractions; "balanced" remains the default for full-meeting summaries.
+_MODEL_TIERS = {
+    "instant": "llama-3.1-8b-instant",
+    "balanced": "llama-3.3-70b-versatile",
+}
+
+def _cuda_available():
+    """Probe for a usable CUDA device without making torch a hard dependency"""
+    try:
+        import torch
+        return torch.cuda.is_available()
+    except ImportError:
+        return False
+
 class MeetingAssistant:
     def __init__(self):
         print("Loading AI models...")
-        
+
         try:
-            self.whisper_model = whisper.load_model("base")
-            print("✅ Whisper model loaded")
+            # FP16 on GPU is ~10x faster than the CPU path; INT8 is the
+            # fastest CPU option. Pick per detected hardware.
+            device = "cuda" if _cuda_available() else "cpu"
+            self._fp16 = device == "cuda"
+
+            if USING_FASTER_WHISPER:
+                compute_type = "float16" if device == "cuda" else "int8"
+                self.whisper_model = WhisperModel("base", device=device, compute_type=compute_type)
+            else:
+                self.whisper_model = whisper.load_model("base", device=device)
+            print(f"✅ Whisper model loaded ({device})")
         except Exception as e:
             print(f"❌ Whisper loading error: {e}")
             self.whisper_model = None
+
+        # Batched decoding for offline files: independent 30s windows run
+        # in parallel instead of strictly sequentially
+        self._batched = None
+        if self.whisper_model and USING_FASTER_WHISPER and BatchedInferencePipeline:
+            try:
+                self._batched = BatchedInferencePipeline(model=self.whisper_model)
+            except Exception as e:
+                print(f"⚠️  Batched pipeline unavailable: {e}")
         
         # Initialize appropriate noise processor
         # For now, use BasicNoiseFilter for better compatibility
@@ -172,8 +341,49 @@ class MeetingAssistant:
             self.noise_processor = BasicNoiseFilter()
             print("📌 Using BasicNoiseFilter (simpler, more permissive)")
             
+        # Rolling tail of the previous chunk's text, fed back as the decoder
+        # prompt so acoustic context carries across chunk boundaries
+        self._prev_tail = ""
+
+        # LLM analyses keyed by (provider, text hash): clicking Generate
+        # Summary again on an unchanged transcript costs nothing
+        self._analysis_cache = {}
+
         self.setup_ai_providers()
-        
+
+    def reset_stream_context(self):
+        """Forget the rolling prompt tail between recordings"""
+        self._prev_tail = ""
+
+    def _whisper_text(self, audio, use_context=False):
+        """Run the loaded Whisper backend on audio (array or path), return text"""
+        prompt = self._prev_tail or None if use_context else None
+        if USING_FASTER_WHISPER:
+            # Uploaded files go through the batched pipeline: their 30s
+            # windows are independent, so decoding them batch_size at a
+            # time scales with cores instead of running sequentially
+            if isinstance(audio, str) and self._batched is not None:
+                segments, _info = self._batched.transcribe(
+                    audio, language="en", batch_size=8
+                )
+                return " ".join(seg.text.strip() for seg in segments).strip()
+            # Silero VAD (bundled with faster-whisper as ONNX) segments the
+            # input and only the speech regions reach the encoder, so pauses
+            # inside a chunk cost nothing. The noise processor still gates
+            # fully-silent chunks before we get here.
+            segments, _info = self.whisper_model.transcribe(
+                audio,
+                language="en",
+                beam_size=1,
+                condition_on_previous_text=False,
+                initial_prompt=prompt,
+                vad_filter=True,
+                vad_parameters={"min_silence_duration_ms": 500}
+            )
+            return " ".join(seg.text.strip() for seg in segments).strip()
+        result = self.whisper_model.transcribe(audio, fp16=self._fp16, initial_prompt=prompt)
+        return result["text"].strip()
+
     def setup_ai_providers(self):
         self.providers = {}
 
@@ -197,38 +407,38 @@ class MeetingAssistant:
             return ""
 
         try:
-            # Check raw audio level first
-            raw_level = np.mean(np.abs(audio_data))
-            print(f"🎤 Raw audio level: {raw_level:.4f}")
-
             # Apply noise filtering
             processed_audio = self.noise_processor.process_audio(audio_data)
 
             if processed_audio is None:
-                print("⚠️  No speech detected by noise processor")
+                log.debug("No speech detected by noise processor")
                 return ""  # No speech detected
 
             # Check minimum volume (reduced threshold)
             audio_level = np.mean(np.abs(processed_audio))
-            print(f"🔊 Processed audio level: {audio_level:.4f}")
+            log.debug("Processed audio level: %.4f", audio_level)
 
             if audio_level < 0.002:  # Reduced from 0.005
-                print(f"⚠️  Audio too quiet: {audio_level:.4f} < 0.002")
+                log.debug("Audio too quiet: %.4f < 0.002", audio_level)
                 return ""
 
             # Transcribe
-            print("🤖 Transcribing with Whisper...")
-            result = self.whisper_model.transcribe(processed_audio)
-            text = result["text"].strip()
+            text = self._whisper_text(processed_audio, use_context=True)
 
-            print(f"📝 Whisper output: '{text}' (length: {len(text)})")
+            log.debug("Whisper output: %r (length: %d)", text, len(text))
 
             # Filter short false positives
             if len(text) < 3:
-                print(f"⚠️  Text too short: '{text}'")
                 return ""
 
-            print(f"✅ Transcription successful: '{text}'")
+            # Drop degenerate outputs: looping n-grams or pretraining boilerplate
+            if text.lower().strip(" .!?") in _BOILERPLATE or _has_ngram_repeat(text):
+                log.debug("Dropping degenerate Whisper output: %r", text)
+                return ""
+
+            # Keep the last ~20 words as decoder context for the next chunk
+            self._prev_tail = " ".join(text.split()[-20:])
+
             return text
 
         except Exception as e:
@@ -237,7 +447,7 @@ class MeetingAssistant:
             traceback.print_exc()
             return ""
     
-    def analyze_with_ai(self, text, provider='groq', timeout=30):
+    def analyze_with_ai(self, text, provider='groq', timeout=30, tier='balanced'):
         if not text or len(text) < 10:
             return {"summary": "", "actions": [], "decisions": [], "key_points": []}
 
@@ -247,21 +457,26 @@ class MeetingAssistant:
             else:
                 return self.simple_analysis(text)
 
+        cache_key = (provider, tier, hashlib.md5(text.encode('utf-8')).hexdigest())
+        cached = self._analysis_cache.get(cache_key)
+        if cached is not None:
+            log.debug("Analysis cache hit for %s", cache_key)
+            return cached
+
         try:
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(self.analyze_with_openai, text, provider)
-                try:
-                    result = future.result(timeout=timeout)
-                    return result
-                except concurrent.futures.TimeoutError:
-                    return self.simple_analysis(text)
-                    
+            result = _LLM_POOL.submit(
+                self.analyze_with_openai, text, provider, timeout=timeout, tier=tier
+            ).result()
         except Exception as e:
             print(f"❌ AI analysis error: {e}")
             return self.simple_analysis(text)
-    
-    def analyze_with_openai(self, text, provider):
+
+        if len(self._analysis_cache) >= 64:
+            self._analysis_cache.clear()
+        self._analysis_cache[cache_key] = result
+        return result
+
+    def analyze_with_openai(self, text, provider, timeout=30, tier='balanced'):
         prompt = f"""Analyze briefly:
 
 {text[:2000]}
@@ -274,34 +489,46 @@ Return JSON:
   "key_points": ["point 1"]
 }}"""
 
-        client = self.providers[provider]
-        
+        # The SDK's own timeout replaces the throwaway ThreadPoolExecutor
+        # that used to exist purely to bound this call
+        client = self.providers[provider].with_options(timeout=float(timeout))
+
         response = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
+            model=_MODEL_TIERS.get(tier, _MODEL_TIERS['balanced']),
             messages=[
                 {"role": "system", "content": "Return ONLY valid JSON, no markdown."},
                 {"role": "user", "content": prompt}
             ],
             max_tokens=400,
-            temperature=0.2
+            temperature=0,  # deterministic output keeps the analysis cache effective
+            # Groq/OpenAI enforce valid JSON server-side, so no markdown
+            # fences ever arrive and the fence-stripping logic is gone
+            response_format={"type": "json_object"}
         )
-        
+
         content = response.choices[0].message.content
-        
+
         try:
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0].strip()
-            
-            return json.loads(content)
+            return _json_loads(content)
         except:
-            return self.simple_analysis(text)
+            pass
+
+        # Rescue an object embedded in prose before discarding the paid
+        # response: find the first '{' and let raw_decode stop at the end
+        # of the first valid JSON value
+        start = content.find('{')
+        if start != -1:
+            try:
+                return json.JSONDecoder().raw_decode(content[start:])[0]
+            except ValueError:
+                pass
+
+        return self.simple_analysis(text)
     
     def simple_analysis(self, text):
-        sentences = [s.strip() for s in text.split('.') if s.strip()]
+        sentences = [s.strip() for s in _SENTENCE_SPLIT.split(text, maxsplit=3)[:3] if s.strip()]
         return {
-            "summary": '. '.join(sentences[:2]) + '.' if len(sentences) >= 2 else text[:200],
+            "summary": ' '.join(sentences[:2]) if len(sentences) >= 2 else text[:200],
             "actions": [],
             "decisions": [],
             "key_points": sentences[:3]
@@ -309,8 +536,7 @@ Return JSON:
     
     def process_file(self, filepath, options):
         try:
-            result = self.whisper_model.transcribe(filepath)
-            transcript = result["text"]
+            transcript = self._whisper_text(filepath)
             
             analysis = {"summary": "", "actions": [], "decisions": [], "key_points": []}
             
@@ -331,38 +557,119 @@ Return JSON:
     
     def save_notes(self, data, source_type):
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"meeting_{source_type}_{timestamp}.json"
-        filepath = Path(app.config['NOTES_FOLDER']) / filename
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        
-        return filename
+        note_id = f"meeting_{source_type}_{timestamp}"
+
+        with _notes_db_lock:
+            db = notes_db()
+            db.execute(
+                "INSERT OR REPLACE INTO notes VALUES (?,?,?,?,?,?,?,?,?)",
+                _note_row(note_id, data)
+            )
+            db.commit()
+
+        return note_id
 
 assistant = MeetingAssistant()
 
+# Notes live in a single SQLite database instead of one JSON file per note:
+# listing is one indexed query rather than a directory scan with a JSON
+# parse per file, and fetch/delete are single-row statements. Legacy *.json
+# notes are imported on first open so nothing already saved disappears.
+_NOTES_DB = None
+_notes_db_lock = threading.Lock()
+
+def notes_db():
+    """Open the notes database once, migrating any legacy JSON notes"""
+    global _NOTES_DB
+    if _NOTES_DB is None:
+        db = sqlite3.connect(
+            str(Path(app.config['NOTES_FOLDER']) / 'notes.db'),
+            check_same_thread=False
+        )
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS notes (
+                id TEXT PRIMARY KEY,
+                title TEXT,
+                date TEXT,
+                source TEXT,
+                transcript TEXT,
+                summary TEXT,
+                actions_json TEXT,
+                decisions_json TEXT,
+                key_points_json TEXT
+            )
+        """)
+        _migrate_json_notes(db)
+        _NOTES_DB = db
+    return _NOTES_DB
+
+def _migrate_json_notes(db):
+    """One-time import of per-note JSON files left by older versions"""
+    for note_file in Path(app.config['NOTES_FOLDER']).glob('*.json'):
+        try:
+            with open(note_file, 'rb') as f:
+                data = _json_loads(f.read())
+            db.execute(
+                "INSERT OR IGNORE INTO notes VALUES (?,?,?,?,?,?,?,?,?)",
+                _note_row(note_file.stem, data)
+            )
+        except Exception as e:
+            print(f"Error migrating note {note_file}: {e}")
+            continue
+    db.commit()
+
+def _note_row(note_id, data):
+    """Flatten a notes dict into a row for the notes table"""
+    return (
+        note_id,
+        data.get('title', note_id),
+        data.get('timestamp', ''),
+        data.get('source', 'unknown'),
+        data.get('transcript', ''),
+        data.get('summary', ''),
+        _json_dumps(data.get('actions', [])),
+        _json_dumps(data.get('decisions', [])),
+        _json_dumps(data.get('key_points', [])),
+    )
+
+def _fmt_note_date(timestamp):
+    try:
+        return datetime.fromisoformat(timestamp).strftime('%Y-%m-%d %H:%M')
+    except:
+        return 'Unknown date'
+
 # Routes
 @app.route('/')
 def index():
     return render_template('index.html')
 
+# Enumerating devices probes hardware and the device set rarely changes,
+# so the list is refreshed lazily at most every 30 seconds
+_devices_cache = (0.0, None)
+
 @app.route('/api/devices')
 def get_devices():
+    global _devices_cache
     try:
-        p = pyaudio.PyAudio()
-        devices = []
+        cached_at, devices = _devices_cache
 
-        for i in range(p.get_device_count()):
-            info = p.get_device_info_by_index(i)
-            if info['maxInputChannels'] > 0:
-                devices.append({
-                    "id": i,
-                    "name": info['name'],
-                    "inputs": info['maxInputChannels'],
-                    "rate": int(info['defaultSampleRate'])
-                })
+        if devices is None or time.time() - cached_at > 30:
+            p = pa()
+            devices = []
+
+            for i in range(p.get_device_count()):
+                info = p.get_device_info_by_index(i)
+                if info['maxInputChannels'] > 0:
+                    devices.append({
+                        "id": i,
+                        "name": info['name'],
+                        "inputs": info['maxInputChannels'],
+                        "rate": int(info['defaultSampleRate'])
+                    })
+
+            _devices_cache = (time.time(), devices)
 
-        p.terminate()
         return jsonify(devices)
     except Exception as e:
         print(f"Error getting devices: {e}")
@@ -372,64 +679,76 @@ def get_devices():
 def auto_detect_device():
     """Detect which audio device is currently receiving audio"""
     try:
-        p = pyaudio.PyAudio()
+        p = pa()
         best_device = None
         max_level = 0
         all_devices_data = []
 
         print("\n🔍 Auto-detecting active audio device...")
 
-        # Sample each device for a short duration to detect audio activity
+        def probe_device(i, info):
+            """Open a device, sample ~3 chunks, return (index, name, level)"""
+            # Each probe gets its own scratch buffer — the int16→float32
+            # conversion writes into it in place instead of allocating per read
+            probe_buf = np.empty(2048, dtype=np.float32)
+            stream = p.open(
+                format=pyaudio.paInt16,
+                channels=1,
+                rate=int(info['defaultSampleRate']),
+                input=True,
+                input_device_index=i,
+                frames_per_buffer=2048
+            )
+            try:
+                # Read multiple chunks to get a better sample (increased from 1 to 3)
+                levels = []
+                for _ in range(3):
+                    audio_data = stream.read(2048, exception_on_overflow=False)
+                    np.multiply(np.frombuffer(audio_data, dtype=np.int16),
+                                np.float32(1.0 / 32768.0), out=probe_buf)
+                    levels.append(np.mean(np.abs(probe_buf)))
+            finally:
+                stream.stop_stream()
+                stream.close()
+
+            return i, info['name'], float(np.mean(levels))
+
+        input_devices = []
         for i in range(p.get_device_count()):
             info = p.get_device_info_by_index(i)
             if info['maxInputChannels'] > 0:
+                input_devices.append((i, info))
+
+        # Each probe spends most of its time blocked in stream.read, so
+        # sampling the devices in parallel turns N sequential ~0.4s waits
+        # into roughly one.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, max(1, len(input_devices)))) as executor:
+            futures = {executor.submit(probe_device, i, info): (i, info)
+                       for i, info in input_devices}
+            for future in concurrent.futures.as_completed(futures):
+                i, info = futures[future]
                 try:
-                    # Try to open stream and read audio
-                    stream = p.open(
-                        format=pyaudio.paInt16,
-                        channels=1,
-                        rate=int(info['defaultSampleRate']),
-                        input=True,
-                        input_device_index=i,
-                        frames_per_buffer=2048
-                    )
-
-                    # Read multiple chunks to get a better sample (increased from 1 to 3)
-                    levels = []
-                    for _ in range(3):
-                        audio_data = stream.read(2048, exception_on_overflow=False)
-                        audio_np = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32) / 32768.0
-                        levels.append(np.mean(np.abs(audio_np)))
-
-                    # Use the average level
-                    audio_level = np.mean(levels)
-
-                    stream.stop_stream()
-                    stream.close()
-
-                    device_data = {
-                        "id": i,
-                        "name": info['name'],
-                        "level": float(audio_level)
-                    }
-                    all_devices_data.append(device_data)
-
-                    print(f"  Device {i}: {info['name'][:40]} - Level: {audio_level:.4f}")
-
-                    if audio_level > max_level:
-                        max_level = audio_level
-                        best_device = {
-                            "device_id": i,
-                            "device_name": info['name'],
-                            "level": float(audio_level)
-                        }
-
+                    idx, name, audio_level = future.result()
                 except Exception as e:
                     # Skip devices that can't be opened
                     print(f"  Device {i}: {info['name'][:40]} - Skipped ({str(e)[:30]})")
                     continue
 
-        p.terminate()
+                all_devices_data.append({
+                    "id": idx,
+                    "name": name,
+                    "level": audio_level
+                })
+
+                print(f"  Device {idx}: {name[:40]} - Level: {audio_level:.4f}")
+
+                if audio_level > max_level:
+                    max_level = audio_level
+                    best_device = {
+                        "device_id": idx,
+                        "device_name": name,
+                        "level": audio_level
+                    }
 
         if best_device and max_level > 0.001:  # Minimum threshold
             print(f"\n✅ Best device: {best_device['device_name']} (level: {max_level:.4f})")
@@ -499,19 +818,20 @@ def generate_summary():
         if not live_transcript:
             return jsonify({"error": "No transcript available"}), 400
 
-        full_text = " ".join([entry['text'] for entry in live_transcript])
+        full_text = " ".join(live_transcript_texts)
 
         if len(full_text) < 20:
             return jsonify({"error": "Transcript too short"}), 400
 
         provider = request.json.get('provider', 'groq') if request.json else 'groq'
-        analysis = assistant.analyze_with_ai(full_text, provider, timeout=45)
+        tier = request.json.get('tier', 'balanced') if request.json else 'balanced'
+        analysis = assistant.analyze_with_ai(full_text, provider, timeout=45, tier=tier)
 
         notes_data = {
             "title": f"Live Meeting {datetime.now().strftime('%Y-%m-%d %H:%M')}",
             "timestamp": datetime.now().isoformat(),
             "source": "live",
-            "transcript": "\n".join([f"[{e['timestamp']}] {e['text']}" for e in live_transcript]),
+            "transcript": "\n".join(live_transcript_lines),
             **analysis
         }
 
@@ -531,43 +851,26 @@ def generate_summary():
 def get_notes():
     """Get all saved notes"""
     try:
-        notes_dir = Path(app.config['NOTES_FOLDER'])
-        notes = []
-
-        for note_file in notes_dir.glob('*.json'):
-            try:
-                with open(note_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-
-                    # Extract preview from transcript or summary
-                    preview = ""
-                    if data.get('summary'):
-                        preview = data['summary'][:150] + "..."
-                    elif data.get('transcript'):
-                        preview = data['transcript'][:150] + "..."
-
-                    # Parse timestamp
-                    timestamp = data.get('timestamp', '')
-                    try:
-                        date_obj = datetime.fromisoformat(timestamp)
-                        date_str = date_obj.strftime('%Y-%m-%d %H:%M')
-                    except:
-                        date_str = 'Unknown date'
-
-                    notes.append({
-                        'id': note_file.stem,
-                        'title': data.get('title', note_file.stem),
-                        'date': date_str,
-                        'preview': preview,
-                        'duration': 'N/A',  # Can be calculated if needed
-                        'type': data.get('source', 'unknown')
-                    })
-            except Exception as e:
-                print(f"Error reading note {note_file}: {e}")
-                continue
+        with _notes_db_lock:
+            rows = notes_db().execute(
+                "SELECT id, title, date, source, substr(summary, 1, 150), "
+                "substr(transcript, 1, 150) FROM notes ORDER BY date DESC"
+            ).fetchall()
 
-        # Sort by date (newest first)
-        notes.sort(key=lambda x: x['date'], reverse=True)
+        notes = []
+        for note_id, title, date, source, summary_prev, transcript_prev in rows:
+            preview = summary_prev or transcript_prev or ""
+            if preview:
+                preview += "..."
+
+            notes.append({
+                'id': note_id,
+                'title': title or note_id,
+                'date': _fmt_note_date(date),
+                'preview': preview,
+                'duration': 'N/A',  # Can be calculated if needed
+                'type': source or 'unknown'
+            })
 
         return jsonify(notes)
     except Exception as e:
@@ -578,39 +881,33 @@ def get_notes():
 def get_note(note_id):
     """Get a specific note by ID"""
     try:
-        note_file = Path(app.config['NOTES_FOLDER']) / f"{note_id}.json"
-
-        if not note_file.exists():
+        with _notes_db_lock:
+            row = notes_db().execute(
+                "SELECT title, date, source, transcript, summary, "
+                "actions_json, decisions_json, key_points_json "
+                "FROM notes WHERE id = ?", (note_id,)
+            ).fetchone()
+
+        if row is None:
             return jsonify({"error": "Note not found"}), 404
 
-        with open(note_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        # Parse timestamp
-        timestamp = data.get('timestamp', '')
-        try:
-            date_obj = datetime.fromisoformat(timestamp)
-            date_str = date_obj.strftime('%Y-%m-%d %H:%M')
-        except:
-            date_str = 'Unknown date'
+        title, date, source, transcript, summary, actions, decisions, key_points = row
 
-        # Calculate file size
-        file_size = note_file.stat().st_size
-        size_str = f"{file_size / 1024:.1f} KB"
+        size_str = f"{(len(transcript or '') + len(summary or '')) / 1024:.1f} KB"
 
         return jsonify({
             'id': note_id,
-            'title': data.get('title', note_id),
-            'date': date_str,
+            'title': title or note_id,
+            'date': _fmt_note_date(date),
             'duration': 'N/A',
-            'type': data.get('source', 'unknown'),
+            'type': source or 'unknown',
             'size': size_str,
-            'transcript': data.get('transcript', ''),
-            'summary': data.get('summary', ''),
-            'actions': data.get('actions', []),
-            'decisions': data.get('decisions', []),
-            'key_points': data.get('key_points', []),
-            'analysis': data.get('summary', '')  # For full analysis tab
+            'transcript': transcript or '',
+            'summary': summary or '',
+            'actions': _json_loads(actions or '[]'),
+            'decisions': _json_loads(decisions or '[]'),
+            'key_points': _json_loads(key_points or '[]'),
+            'analysis': summary or ''  # For full analysis tab
         })
     except Exception as e:
         print(f"Error getting note: {e}")
@@ -620,12 +917,19 @@ def get_note(note_id):
 def delete_note(note_id):
     """Delete a specific note"""
     try:
-        note_file = Path(app.config['NOTES_FOLDER']) / f"{note_id}.json"
+        with _notes_db_lock:
+            db = notes_db()
+            deleted = db.execute("DELETE FROM notes WHERE id = ?", (note_id,)).rowcount
+            db.commit()
 
-        if not note_file.exists():
+        if not deleted:
             return jsonify({"error": "Note not found"}), 404
 
-        note_file.unlink()
+        # Remove the legacy JSON copy too, or the migration resurrects it
+        legacy_file = Path(app.config['NOTES_FOLDER']) / f"{note_id}.json"
+        if legacy_file.exists():
+            legacy_file.unlink()
+
         return jsonify({"success": True, "message": "Note deleted"})
     except Exception as e:
         print(f"Error deleting note: {e}")
@@ -635,48 +939,47 @@ def delete_note(note_id):
 def download_note(note_id):
     """Download a note as a text file"""
     try:
-        note_file = Path(app.config['NOTES_FOLDER']) / f"{note_id}.json"
-
-        if not note_file.exists():
+        with _notes_db_lock:
+            row = notes_db().execute(
+                "SELECT title, date, source, transcript, summary, "
+                "actions_json, decisions_json, key_points_json "
+                "FROM notes WHERE id = ?", (note_id,)
+            ).fetchone()
+
+        if row is None:
             return jsonify({"error": "Note not found"}), 404
 
-        with open(note_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        title, date, source, transcript, summary, actions, decisions, key_points = row
 
         # Create formatted text content
         content = f"""MEETING NOTES
 =============
 
-Title: {data.get('title', 'Untitled')}
-Date: {data.get('timestamp', 'Unknown')}
-Source: {data.get('source', 'Unknown')}
+Title: {title or 'Untitled'}
+Date: {date or 'Unknown'}
+Source: {source or 'Unknown'}
 
 TRANSCRIPT:
-{data.get('transcript', 'No transcript available')}
+{transcript or 'No transcript available'}
 
 SUMMARY:
-{data.get('summary', 'No summary available')}
+{summary or 'No summary available'}
 
 KEY POINTS:
-{chr(10).join(['- ' + p for p in data.get('key_points', [])])}
+{chr(10).join(['- ' + p for p in _json_loads(key_points or '[]')])}
 
 ACTION ITEMS:
-{chr(10).join(['- ' + a for a in data.get('actions', [])])}
+{chr(10).join(['- ' + a for a in _json_loads(actions or '[]')])}
 
 DECISIONS:
-{chr(10).join(['- ' + d for d in data.get('decisions', [])])}
+{chr(10).join(['- ' + d for d in _json_loads(decisions or '[]')])}
 
 Generated by Smart Meeting Notes
 """
 
-        # Create a temporary file
-        import tempfile
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False, encoding='utf-8') as tmp:
-            tmp.write(content)
-            tmp_path = tmp.name
-
+        # Serve straight from memory — no temp file to write, flush and leak
         return send_file(
-            tmp_path,
+            io.BytesIO(content.encode('utf-8')),
             as_attachment=True,
             download_name=f"{note_id}.txt",
             mimetype='text/plain'
@@ -687,15 +990,29 @@ Generated by Smart Meeting Notes
 
 @socketio.on('start_recording')
 def handle_start_recording(data):
-    global recording_active, recording_paused, recording_thread, live_transcript
-    
-    if recording_active:
+    global recording_thread, live_transcript
+    global live_transcript_lines, live_transcript_texts
+
+    if not _stop_evt.is_set():
         emit('error', {'message': 'Recording already in progress'})
         return
-    
-    recording_active = True
-    recording_paused = False
+
+    # The previous loop can still be mid-iteration (a Whisper call runs for
+    # seconds) after stop was requested. Wait for it to wind down before
+    # re-arming the events, or the old loop would resume alongside the new
+    # thread and its cleanup would close the new shared stream.
+    if recording_thread is not None and recording_thread.is_alive():
+        recording_thread.join(timeout=30)
+        if recording_thread.is_alive():
+            emit('error', {'message': 'Previous recording is still shutting down'})
+            return
+
+    _pause_evt.clear()
+    _stop_evt.clear()
     live_transcript = []
+    live_transcript_lines = []
+    live_transcript_texts = []
+    assistant.reset_stream_context()
     
     recording_thread = threading.Thread(
         target=record_audio,
@@ -711,38 +1028,79 @@ def handle_start_recording(data):
 
 @socketio.on('stop_recording')
 def handle_stop_recording():
-    global recording_active
-    recording_active = False
+    _stop_evt.set()
     emit('recording_status', {'status': 'Recording stopped'})
     emit('recording_complete', {'message': 'Click "Generate Summary" to analyze'})
 
 @socketio.on('pause_recording')
 def handle_pause_recording():
-    global recording_paused
-    recording_paused = True
+    _pause_evt.set()
     emit('recording_status', {'status': 'Paused'})
 
 @socketio.on('resume_recording')
 def handle_resume_recording():
-    global recording_paused
-    recording_paused = False
+    _pause_evt.clear()
     emit('recording_status', {'status': 'Recording...'})
 
 @socketio.on('reset_transcript')
 def handle_reset_transcript():
-    global live_transcript
+    global live_transcript, live_transcript_lines, live_transcript_texts
     live_transcript = []
+    live_transcript_lines = []
+    live_transcript_texts = []
     print("🔄 Transcript reset by user")
     emit('recording_status', {'status': 'Ready to record'})
 
 def record_audio(device_id, capture_type):
-    global recording_active, recording_paused, audio_stream, live_transcript
+    global audio_stream, live_transcript
 
     print(f"\n{'='*60}")
     print(f"🎙️  Starting recording from device {device_id} ({capture_type})")
     print(f"{'='*60}\n")
 
-    p = pyaudio.PyAudio()
+    p = pa()
+
+    # Producer/consumer split: a capture thread keeps draining the stream in
+    # ~1s frames while Whisper runs, so inference never stalls the stream and
+    # PyAudio's internal buffer can't overflow during a slow chunk.
+    # PortAudio hands over 30ms buffers (the standard VAD frame size) rather
+    # than multi-second jumbo buffers: ~1KB per read instead of 160KB, and
+    # pause/stop take effect within a frame instead of a second.
+    VAD_FRAME_SAMPLES = 480              # 30ms at 16kHz
+    READS_PER_FRAME = 33                 # 33 reads ≈ 0.99s per queued frame
+    FRAME_SAMPLES = VAD_FRAME_SAMPLES * READS_PER_FRAME
+    FRAMES_PER_WINDOW = 5                # ~5 second windows for Whisper
+
+    frame_q = queue.Queue(maxsize=8)
+
+    def capture_frames():
+        while not _stop_evt.is_set():
+            if _pause_evt.is_set():
+                # Sleep via the stop event so a stop wakes us immediately
+                _stop_evt.wait(0.05)
+                continue
+            try:
+                data = b''.join(
+                    audio_stream.read(VAD_FRAME_SAMPLES, exception_on_overflow=False)
+                    for _ in range(READS_PER_FRAME)
+                )
+            except Exception as e:
+                print(f"❌ Capture error: {e}")
+                socketio.emit('error', {'message': str(e)})
+                # Stop the whole recording, not just this thread — the
+                # consumer would otherwise poll an empty queue forever
+                # while the UI shows a recording that captures nothing
+                _stop_evt.set()
+                break
+            try:
+                frame_q.put_nowait(data)
+            except queue.Full:
+                # Drop the oldest frame rather than stall the capture stream
+                try:
+                    frame_q.get_nowait()
+                except queue.Empty:
+                    pass
+                frame_q.put_nowait(data)
 
     try:
         # Get device info
@@ -756,24 +1114,38 @@ def record_audio(device_id, capture_type):
             rate=16000,
             input=True,
             input_device_index=device_id,
-            frames_per_buffer=16000 * 5
+            frames_per_buffer=VAD_FRAME_SAMPLES
         )
 
         print("✅ Audio stream opened successfully")
+
+        producer = threading.Thread(target=capture_frames, daemon=True)
+        producer.start()
+
         chunk_count = 0
+        window = []
 
-        while recording_active:
-            if recording_paused:
-                time.sleep(0.1)
+        # Preallocated float32 window, reused across chunks: each frame is
+        # scaled straight into its slice, avoiding the b''.join + astype copies
+        window_f32 = np.empty(FRAME_SAMPLES * FRAMES_PER_WINDOW, dtype=np.float32)
+
+        while not _stop_evt.is_set():
+            try:
+                window.append(frame_q.get(timeout=0.5))
+            except queue.Empty:
+                continue
+            if len(window) < FRAMES_PER_WINDOW:
                 continue
 
             chunk_count += 1
-            print(f"\n--- Chunk {chunk_count} ---")
-
-            audio_data = audio_stream.read(16000 * 5, exception_on_overflow=False)
-            audio_np = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32) / 32768.0
+            log.debug("--- Chunk %d ---", chunk_count)
 
-            print(f"📦 Audio chunk size: {len(audio_np)} samples")
+            for j, frame in enumerate(window):
+                np.multiply(np.frombuffer(frame, dtype=np.int16),
+                            np.float32(1.0 / 32768.0),
+                            out=window_f32[j * FRAME_SAMPLES:(j + 1) * FRAME_SAMPLES])
+            audio_np = window_f32
+            window = []
 
             transcript = assistant.transcribe_audio(audio_np)
 
@@ -783,17 +1155,19 @@ def record_audio(device_id, capture_type):
                     'timestamp': timestamp,
                     'text': transcript
                 })
+                live_transcript_lines.append(f"[{timestamp}] {transcript}")
+                live_transcript_texts.append(transcript)
 
-                print(f"🎯 Emitting transcript update: [{timestamp}] {transcript}")
+                log.debug("Emitting transcript update: [%s] %s", timestamp, transcript)
 
                 socketio.emit('transcript_update', {
                     'timestamp': timestamp,
                     'text': transcript
                 })
             else:
-                print("⚠️  No transcript generated for this chunk")
+                log.debug("No transcript generated for this chunk")
 
-            time.sleep(0.1)
+        producer.join(timeout=2)
 
     except Exception as e:
         print(f"❌ Recording error: {e}")
@@ -801,11 +1175,14 @@ def record_audio(device_id, capture_type):
         traceback.print_exc()
         socketio.emit('error', {'message': str(e)})
     finally:
+        # Re-arm the stop event even when the loop died on an exception
+        # (e.g. a bad device id) — otherwise every later start would be
+        # rejected as "already in progress" until the app restarts
+        _stop_evt.set()
         print("\n🛑 Stopping recording...")
         if audio_stream:
             audio_stream.stop_stream()
             audio_stream.close()
-        p.terminate()
         print("✅ Recording stopped cleanly")
 
 if __name__ == '__main__':